@@ -1,14 +1,23 @@
 from __future__ import absolute_import
 
-import pandas as pd
-from matplotlib import pyplot as plt
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
 
 try:
     from highcharts import Highchart, Highstock
+    from highcharts.highstock.common import RawJavaScriptText
 except ImportError:
     raise ImportError("Could not import highcharts library.  Install with `` pip install python-highcharts `` ")
-from toolz import assoc
 from enum import IntEnum
+from types import MappingProxyType
+
+_DEFAULT_COLORS = ('#7cb5ec', '#434348', '#90ed7d', '#f7a35c', '#8085e9',
+                   '#f15c80', '#e4d354', '#2b908f', '#f45b5b', '#91e8e1')
+
+# series longer than this are written straight to JSON when numba is installed
+_FAST_JSON_MIN_ROWS = 100000
 
 
 class DefaultRange(IntEnum):
@@ -21,7 +30,10 @@ class DefaultRange(IntEnum):
 
 
 class _CommonOptions(object):
-    axisFormatDateTime = {
+    # Options shared by every chart call.  They are read-only and highcharts copies them into its own
+    # option objects, so they are passed as is, or through a dict() copy to override keys.  Nested
+    # values stay plain dicts since highcharts only accepts those below the top level
+    axisFormatDateTime = MappingProxyType({
         'type': 'datetime',
         'dateTimeLabelFormats': {
             'millisecond': '%H:%M:%S.%L',
@@ -37,7 +49,357 @@ class _CommonOptions(object):
         'title': {
             'enabled': False
         }
+    })
+
+    plotOptionsAreaStacked = MappingProxyType({
+        'area': {
+            'stacking': 'normal',
+            'connectNulls': True,
+            'lineWidth': 1,
+            'marker': {
+                'lineWidth': 1,
+            }
+        }
+    })
+
+    plotOptionsAreaPercent = MappingProxyType({
+        'area': dict(plotOptionsAreaStacked['area'], stacking='percent')
+    })
+
+    plotOptionsPercentChange = MappingProxyType({
+        'series': {
+            'compare': 'percent'
+        }
+    })
+
+
+def _to_epoch_ms(date_like):
+    """ Converts a date, or an array of datetime64 values, to milliseconds since the epoch as Highstock expects """
+    if isinstance(date_like, str):
+        # datetime parses UTC offsets ('2020-01-03T00:00+05:00') which numpy only warns about,
+        # numpy is left the partial dates ('2020-01') datetime rejects
+        try:
+            date_like = datetime.fromisoformat(date_like)
+        except ValueError:
+            pass
+    if isinstance(date_like, datetime) and date_like.tzinfo is not None:
+        # numpy has no time zones, make aware dates naive UTC before the cast
+        date_like = date_like.astimezone(timezone.utc).replace(tzinfo=None)
+    ms = np.asarray(date_like, dtype='datetime64[ms]').view('int64')
+    return int(ms) if ms.ndim == 0 else ms
+
+
+def _check_timeseries(data):
+    """ Raises TypeError unless data has a datetime index and only int/float columns, ValueError on NaT """
+    if data.index.dtype.kind != 'M':
+        raise TypeError("data must have a datetime/timestamp index, got %s.  Convert with "
+                        "`` df.index = pd.to_datetime(df.index) ``" % data.index.dtype)
+    if data.index.hasnans:
+        raise ValueError("data index contains NaT, drop those rows with "
+                         "`` df = df[df.index.notna()] ``")
+    bad_columns = [name for name, dtype in data.dtypes.items() if dtype.kind not in 'iuf']
+    if bad_columns:
+        raise TypeError("data columns must be numeric, got non-numeric columns %s.  Convert with "
+                        "`` df = df.astype('float64') ``" % bad_columns)
+
+
+@lru_cache(maxsize=64)
+def _palette(cmap, n, norm=None):
+    """ Returns n hex colors from a matplotlib colormap name or instance, for series 0..n-1 normalized over [0, n] """
+    # imported here, only area charts with a cmap need matplotlib and pyplot is never needed
+    import matplotlib
+    import matplotlib.colors
+
+    if norm is None:
+        norm = matplotlib.colors.Normalize
+    colormap = matplotlib.colormaps[cmap] if isinstance(cmap, str) else cmap
+    return tuple(matplotlib.colors.to_hex(c) for c in colormap(norm(vmin=0, vmax=n)(np.arange(n))))
+
+
+# ASCII codes used by the numba JSON writer
+_ZERO = ord('0')
+_DOT = ord('.')
+_MINUS = ord('-')
+_COMMA = ord(',')
+_EXP = ord('e')
+_OPEN = ord('[')
+_CLOSE = ord(']')
+_NULL = tuple(ord(c) for c in 'null')
+# the powers of ten that are exact in float64
+_POW10 = tuple(float(10 ** i) for i in range(23))
+# Veltkamp splitter, 2 ** 27 + 1, for exact float64 products
+_SPLIT = 134217729.0
+
+
+@lru_cache(maxsize=None)
+def _fast_json_pairs():
+    """ Returns the numba compiled JSON writer for [epoch ms, value] points, or None without numba
+
+    numba is imported and the writer compiled on first use, so only charts with long series pay for it
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    # a single function on purpose: jitted closures that call each other miss numba's on-disk cache
+    @njit(cache=True)
+    def fast_json_pairs(ts_ms, vals):
+        """ Returns the JSON array [[t, v], ...] of epoch ms timestamps and values as ASCII bytes
+
+        Values are written with 15 significant digits, NaN and infinities as null.  They are
+        rounded exactly as '%.15g' for 1e-8 <= |v| < 1e37, outside that the 15th digit can be
+        off by one
+        """
+        # at most 20 bytes per timestamp and 22 per value, plus the brackets and commas
+        buf = np.empty(64 * len(vals) + 2, dtype=np.uint8)
+        # digits of the number being written
+        tmp = np.empty(20, dtype=np.uint8)
+        buf[0] = _OPEN
+        pos = 1
+        for i in range(len(vals)):
+            if i > 0:
+                buf[pos] = _COMMA
+                pos += 1
+            buf[pos] = _OPEN
+            pos += 1
+
+            # timestamp, digits come out least significant first
+            t = ts_ms[i]
+            n = 0
+            if t < 0:
+                buf[pos] = _MINUS
+                pos += 1
+                # peel the last digit off before negating, -t overflows for the int64 minimum
+                tmp[0] = _ZERO - t % -10
+                t //= -10
+                n = 1
+            while t > 0 or n == 0:
+                tmp[n] = _ZERO + t % 10
+                t //= 10
+                n += 1
+            for k in range(n - 1, -1, -1):
+                buf[pos] = tmp[k]
+                pos += 1
+            buf[pos] = _COMMA
+            pos += 1
+
+            value = vals[i]
+            if not np.isfinite(value):
+                for c in _NULL:
+                    buf[pos] = c
+                    pos += 1
+            elif value == 0.0:
+                buf[pos] = _ZERO
+                pos += 1
+            else:
+                if value < 0.0:
+                    buf[pos] = _MINUS
+                    pos += 1
+                    value = -value
+
+                # value ~= digits * 10 ** (exp - 14), with digits a 15 digit integer
+                exp = int(np.floor(np.log10(value)))
+                for tries in range(3):
+                    # scale by 10 ** (14 - exp) in steps of exact powers of ten, so each step
+                    # rounds once and nothing overflows for very small or large values
+                    scaled = value
+                    k = 14 - exp
+                    while k > 22:
+                        scaled *= _POW10[22]
+                        k -= 22
+                    while k < -22:
+                        scaled /= _POW10[22]
+                        k += 22
+                    # last step: hi is the rounded result and lo what it misses of the exact one,
+                    # from Dekker's exact product x * p = prod + err
+                    p = _POW10[abs(k)]
+                    hi = scaled * p if k >= 0 else scaled / p
+                    x = scaled if k >= 0 else hi
+                    prod = x * p
+                    c = _SPLIT * x
+                    xh = c - (c - x)
+                    xl = x - xh
+                    c = _SPLIT * p
+                    ph = c - (c - p)
+                    pl = p - ph
+                    err = ((xh * ph - prod) + xh * pl + xl * ph) + xl * pl
+                    lo = err if k >= 0 else ((scaled - prod) - err) / p
+                    # log10 can be off by one near powers of ten, the exact hi + lo must have 15 digits.
+                    # Past the exact powers hi + lo is itself rounded, the tries bound keeps that from
+                    # bouncing between two exponents
+                    if tries < 2 and (hi > 1e15 or (hi == 1e15 and lo >= 0.0)):
+                        exp += 1
+                        continue
+                    if tries < 2 and (hi < 1e14 or (hi == 1e14 and lo < 0.0)):
+                        exp -= 1
+                        continue
+                    # round hi + lo to an integer, ties to even as printf does
+                    digits = np.round(hi)
+                    d = (hi - digits) + lo
+                    if d > 0.5 or (d == 0.5 and digits % 2 == 1):
+                        digits += 1
+                    elif d < -0.5 or (d == -0.5 and digits % 2 == 1):
+                        digits -= 1
+                    digits = np.int64(digits)
+                    while digits >= 10 ** 15:
+                        # 999999999999999.5 and up round to the next power of ten
+                        digits = (digits + 5) // 10
+                        exp += 1
+                    break
+                ndigits = 15
+                while ndigits > 1 and digits % 10 == 0:
+                    digits //= 10
+                    ndigits -= 1
+                # significant digits, most significant first
+                for k in range(ndigits - 1, -1, -1):
+                    tmp[k] = _ZERO + digits % 10
+                    digits //= 10
+
+                if 0 <= exp < 15:
+                    # plain notation, 123.45 or 12300
+                    for k in range(max(ndigits, exp + 1)):
+                        if k == exp + 1:
+                            buf[pos] = _DOT
+                            pos += 1
+                        buf[pos] = tmp[k] if k < ndigits else _ZERO
+                        pos += 1
+                elif -6 < exp < 0:
+                    # leading zeros, 0.00123
+                    buf[pos] = _ZERO
+                    buf[pos + 1] = _DOT
+                    pos += 2
+                    for k in range(-exp - 1):
+                        buf[pos] = _ZERO
+                        pos += 1
+                    for k in range(ndigits):
+                        buf[pos] = tmp[k]
+                        pos += 1
+                else:
+                    # exponent notation, 1.2345e-7, the exponent has at most 3 digits
+                    buf[pos] = tmp[0]
+                    pos += 1
+                    if ndigits > 1:
+                        buf[pos] = _DOT
+                        pos += 1
+                        for k in range(1, ndigits):
+                            buf[pos] = tmp[k]
+                            pos += 1
+                    buf[pos] = _EXP
+                    pos += 1
+                    if exp < 0:
+                        buf[pos] = _MINUS
+                        pos += 1
+                        exp = -exp
+                    if exp >= 100:
+                        buf[pos] = _ZERO + exp // 100
+                        pos += 1
+                    if exp >= 10:
+                        buf[pos] = _ZERO + exp // 10 % 10
+                        pos += 1
+                    buf[pos] = _ZERO + exp % 10
+                    pos += 1
+
+            buf[pos] = _CLOSE
+            pos += 1
+        buf[pos] = _CLOSE
+        return buf[:pos + 1].tobytes()
+
+    return fast_json_pairs
+
+
+def _timeseries_data(data, dropna=False):
+    """ Returns a list of [epoch ms, value] points for each column of a datetime indexed dataframe
+
+    The frame is converted to one float64 array and every column is copied next to the
+    timestamps in a single reused (rows, 2) buffer before tolist. With dropna the NaN rows
+    of each column are left out, for charts that connect over nulls anyway
+
+    Long series are instead written to JSON text by numba, when it is installed, and handed
+    to highcharts as raw javascript so no python object is made per point.  The same frame then
+    renders differently depending only on its row count: the numba path writes 15 significant
+    digits where the tolist path writes the full repr (0.30000000000000004 becomes 0.3), and
+    writes NaN and +/-inf as null where the tolist path writes NaN and Infinity
+    """
+    _check_timeseries(data)
+    vals = data.to_numpy(dtype='float64', na_value=np.nan)
+    ts = _to_epoch_ms(data.index.values)
+
+    fast_json_pairs = _fast_json_pairs() if len(data) > _FAST_JSON_MIN_ROWS else None
+    if fast_json_pairs is not None:
+        points = []
+        for j in range(vals.shape[1]):
+            keep = ~np.isnan(vals[:, j]) if dropna else slice(None)
+            text = fast_json_pairs(np.ascontiguousarray(ts[keep]), np.ascontiguousarray(vals[keep, j]))
+            points.append(RawJavaScriptText(text.decode('ascii')))
+        return points
+
+    pairs = np.empty((len(data), 2))
+    pairs[:, 0] = ts
+
+    points = []
+    for j in range(vals.shape[1]):
+        pairs[:, 1] = vals[:, j]
+        if dropna:
+            points.append(pairs[~np.isnan(vals[:, j])].tolist())
+        else:
+            points.append(pairs.tolist())
+    return points
+
+
+def _add_series(H, series):
+    """ Adds a list of series, each a dict of add_data_set arguments, to the chart
+
+    python-highcharts only serializes series registered through add_data_set, a 'series'
+    entry can not be passed to set_dict_options, so this is the one place they are added
+    """
+    for kwargs in series:
+        H.add_data_set(**kwargs)
+
+
+def _area_colors(n, cmap=None, norm=None):
+    """ Returns the colors of n area series, the highcharts defaults unless a matplotlib cmap is given """
+    if cmap is None:
+        return [_DEFAULT_COLORS[i % len(_DEFAULT_COLORS)] for i in range(n)]
+    if isinstance(cmap, str) or not cmap:
+        return _palette(cmap or 'RdYlBu', n, norm)
+    # Colormap instances are unhashable, they skip the cache
+    return _palette.__wrapped__(cmap, n, norm)
+
+
+def _build_timeseries_chart(data, series_kind, extra_options, range_sel, legend=True, secondary=None, colors=None,
+                            dropna=False, figsize_x=900, figsize_y=700):
+    """ Builds the highstock chart behind each of the timeseries chart functions
+
+    Every column of data becomes a series of series_kind, with its NaN points left out when dropna is
+    set, and colors, when given, are applied in column order.  Columns of the secondary dataframe are
+    added as lines on the second y axis.  extra_options are the chart specific options, set together
+    with the legend and range selector
+    """
+    H = Highstock(width=figsize_x, height=figsize_y)
+
+    series = [{'data': points, 'series_type': series_kind, 'name': name}
+              for name, points in zip(data.columns.tolist(), _timeseries_data(data, dropna=dropna))]
+    if colors is not None:
+        for kwargs, color in zip(series, colors):
+            kwargs['color'] = color
+    if secondary is not None:
+        series += [{'data': points, 'series_type': 'line', 'name': name, 'yAxis': 1}
+                   for name, points in zip(secondary.columns.tolist(), _timeseries_data(secondary))]
+    _add_series(H, series)
+
+    options = {
+        'legend': {
+            'enabled': legend
+        },
+        'rangeSelector': {
+            'selected': int(range_sel)
+        },
     }
+    options.update(extra_options)
+    H.set_dict_options(options)
+
+    return H
 
 
 def line_chart(data, y_name='', title='Chart Title', range_sel=DefaultRange.three_month, num_decimals=2, legend=True,
@@ -49,7 +411,7 @@ def line_chart(data, y_name='', title='Chart Title', range_sel=DefaultRange.thre
     Parameters
     ----------
     data : dataframe
-        data with datetime/timestamp index, columns will be the lines
+        data with datetime/timestamp index, columns will be the lines, it is not modified
     y_name : string, optional
         title of y axis
     title : string, optional
@@ -63,26 +425,7 @@ def line_chart(data, y_name='', title='Chart Title', range_sel=DefaultRange.thre
     figsize_y : int
     """
 
-    H = Highstock(width=figsize_x, height=figsize_y)
-
-    data = data.copy()
-
-    groups_name = data.columns.tolist()
-    data['date_field'] = data.index
-    data = data.reset_index(drop=True)
-
-    for name in groups_name:
-        data1 = data.loc[:, ('date_field', name)].values.tolist()
-        H.add_data_set(data1, 'line', name)
-
     options = {
-        'legend': {
-            'enabled': legend
-        },
-        'rangeSelector': {
-            'selected': int(range_sel)
-        },
-
         'title': {
             'text': title,
             'style': {
@@ -106,9 +449,8 @@ def line_chart(data, y_name='', title='Chart Title', range_sel=DefaultRange.thre
 
     }
 
-    H.set_dict_options(options)
-
-    return H
+    return _build_timeseries_chart(data, 'line', options, range_sel, legend,
+                                   figsize_x=figsize_x, figsize_y=figsize_y)
 
 
 def line_customline(data, plotline_date, y_name='', title='Chart Title', range_sel=DefaultRange.three_month,
@@ -121,9 +463,11 @@ def line_customline(data, plotline_date, y_name='', title='Chart Title', range_s
     Parameters
     ----------
     data : dataframe
-        data with datetime/timestamp index, columns will be the lines
+        data with datetime/timestamp index, columns will be the lines, it is not modified
     plotline_date : 'YYYY-MM-DD', time optional
-        string of date when change occurred
+        string of date when change occurred, only ISO 8601 strings are accepted ('2020-01-03', '2020-01-03 12:30'),
+        a UTC offset may be appended ('2020-01-03T00:00+05:00'), a datetime or Timestamp may be given instead,
+        dates with an offset or time zone are converted to UTC
     y_name : string, optional
         title of y axis
     title : string, optional
@@ -140,26 +484,7 @@ def line_customline(data, plotline_date, y_name='', title='Chart Title', range_s
     figsize_y : int
     """
 
-    H = Highstock(width=figsize_x, height=figsize_y)
-
-    data = data.copy()
-
-    groups_name = data.columns.tolist()
-    data['date_field'] = data.index
-    data = data.reset_index(drop=True)
-
-    for name in groups_name:
-        data1 = data.loc[:, ('date_field', name)].values.tolist()
-        H.add_data_set(data1, 'line', name)
-
     options = {
-        'legend': {
-            'enabled': legend
-        },
-        'rangeSelector': {
-            'selected': int(range_sel)
-        },
-
         'title': {
             'text': title,
             'style': {
@@ -168,7 +493,7 @@ def line_customline(data, plotline_date, y_name='', title='Chart Title', range_s
         },
         'xAxis': {
             'plotLines': [{
-                'value': pd.Timestamp(plotline_date).asm8.astype("datetime64[ms]").astype("int64"),
+                'value': _to_epoch_ms(plotline_date),
                 'color': 'black',
                 'width': 2,
                 'zIndex': 4,
@@ -193,9 +518,8 @@ def line_customline(data, plotline_date, y_name='', title='Chart Title', range_s
 
     }
 
-    H.set_dict_options(options)
-
-    return H
+    return _build_timeseries_chart(data, 'line', options, range_sel, legend,
+                                   figsize_x=figsize_x, figsize_y=figsize_y)
 
 
 def area_stacked(data, y_name='', title='Chart title', range_sel=DefaultRange.three_month, num_decimals=2,
@@ -207,7 +531,7 @@ def area_stacked(data, y_name='', title='Chart title', range_sel=DefaultRange.th
     Parameters
     ----------
     data : dataframe
-        data with datetime/timestamp index, columns will be the lines
+        data with datetime/timestamp index, columns will be the lines, it is not modified
     y_name : string, optional
         title of y axis
     title : string, optional
@@ -220,43 +544,13 @@ def area_stacked(data, y_name='', title='Chart title', range_sel=DefaultRange.th
         shows legend of all line names when true, no legend when false
     norm : string?
         should colors be normalized
-    cmap : string, optional
-        set colormap from matplotlib names
+    cmap : string or matplotlib Colormap, optional
+        set colormap from matplotlib names, or a Colormap instance
     figsize_x : int
     figsize_y : int
     """
 
-    H = Highstock(width=figsize_x, height=figsize_y)
-
-    data = data.copy()
-
-    groups_name = data.columns.tolist()
-    data['date_field'] = data.index
-    data = data.reset_index(drop=True)
-
-    if norm is None:
-        norm = plt.matplotlib.colors.Normalize
-    normInstance = norm(vmin=0, vmax=len(groups_name))
-    colormap = plt.cm.get_cmap(cmap or 'RdYlBu')
-
-    default_colors = ['#7cb5ec', '#434348', '#90ed7d', '#f7a35c', '#8085e9', '#f15c80', '#e4d354', '#2b908f', '#f45b5b',
-                      '#91e8e1'] * 10
-
-    for i, name in enumerate(groups_name):
-        if cmap is None:
-            color = default_colors[i]
-        else:
-            color = plt.matplotlib.colors.rgb2hex(colormap(normInstance(i)))
-        data1 = data.loc[:, ('date_field', name)].values.tolist()
-        H.add_data_set(data1, 'area', name, color=color)
-
     options = {
-        'legend': {
-            'enabled': legend
-        },
-        'rangeSelector': {
-            'selected': int(range_sel)
-        },
         'title': {
             'text': title,
             'style': {
@@ -282,21 +576,12 @@ def area_stacked(data, y_name='', title='Chart title', range_sel=DefaultRange.th
             'xDateFormat': '%A, %b %d, %Y',
             'valueDecimals': num_decimals,
         },
-        'plotOptions': {
-            'area': {
-                'stacking': 'normal',
-                'connectNulls': True,
-                'lineWidth': 1,
-                'marker': {
-                    'lineWidth': 1,
-                }
-            }
-        }
+        'plotOptions': _CommonOptions.plotOptionsAreaStacked
     }
 
-    H.set_dict_options(options)
-
-    return H
+    return _build_timeseries_chart(data, 'area', options, range_sel, legend,
+                                   colors=_area_colors(len(data.columns), cmap, norm), dropna=True,
+                                   figsize_x=figsize_x, figsize_y=figsize_y)
 
 
 def area_pct_total(data, y_name='', title='Chart title', range_sel=DefaultRange.three_month, num_decimals=2,
@@ -308,7 +593,7 @@ def area_pct_total(data, y_name='', title='Chart title', range_sel=DefaultRange.
     Parameters
     ----------
     data : dataframe
-        data with datetime/timestamp index, columns will be the lines
+        data with datetime/timestamp index, columns will be the lines, it is not modified
     y_name : string, optional
         title of y axis
     title : string, optional
@@ -321,44 +606,13 @@ def area_pct_total(data, y_name='', title='Chart title', range_sel=DefaultRange.
         shows legend of all line names when true, no legend when false
     norm : NoneType
         should colors be normalized
-    cmap : string, optional
-        set colormap from matplotlib names
+    cmap : string or matplotlib Colormap, optional
+        set colormap from matplotlib names, or a Colormap instance
     figsize_x : int
     figsize_y : int
     """
 
-    H = Highstock(width=figsize_x, height=figsize_y)
-
-    groups_name = data.columns.tolist()
-
-    data = data.copy()
-
-    data['date_field'] = data.index
-    data = data.reset_index(drop=True)
-
-    if norm is None:
-        norm = plt.matplotlib.colors.Normalize
-    normInstance = norm(vmin=0, vmax=len(groups_name))
-    colormap = plt.cm.get_cmap(cmap or 'RdYlBu')
-
-    default_colors = ['#7cb5ec', '#434348', '#90ed7d', '#f7a35c', '#8085e9',
-                      '#f15c80', '#e4d354', '#2b908f', '#f45b5b', '#91e8e1'] * 10
-
-    for i, name in enumerate(groups_name):
-        if cmap is None:
-            color = default_colors[i]
-        else:
-            color = plt.matplotlib.colors.rgb2hex(colormap(normInstance(i)))
-        data1 = data.loc[:, ('date_field', name)].values.tolist()
-        H.add_data_set(data1, 'area', name, color=color)
-
     options = {
-        'legend': {
-            'enabled': legend
-        },
-        'rangeSelector': {
-            'selected': int(range_sel)
-        },
         'title': {
             'text': title,
             'style': {
@@ -384,21 +638,12 @@ def area_pct_total(data, y_name='', title='Chart title', range_sel=DefaultRange.
             'pointFormat': '<span style="color:{series.color}">{series.name}</span>: <b>{point.y}</b> ({point.percentage:.2f}%)<br/>',
             'valueDecimals': num_decimals,
         },
-        'plotOptions': {
-            'area': {
-                'stacking': 'percent',
-                'connectNulls': True,
-                'lineWidth': 1,
-                'marker': {
-                    'lineWidth': 1,
-                }
-            }
-        }
+        'plotOptions': _CommonOptions.plotOptionsAreaPercent
     }
 
-    H.set_dict_options(options)
-
-    return H
+    return _build_timeseries_chart(data, 'area', options, range_sel, legend,
+                                   colors=_area_colors(len(data.columns), cmap, norm), dropna=True,
+                                   figsize_x=figsize_x, figsize_y=figsize_y)
 
 
 def line_secondary_y(data, data2, secondy_axis_name, y_name, title='Chart title',
@@ -410,9 +655,9 @@ def line_secondary_y(data, data2, secondy_axis_name, y_name, title='Chart title'
     Parameters
     ----------
     data : dataframe
-        data with datetime/timestamp index, columns will be the lines
+        data with datetime/timestamp index, columns will be the lines, it is not modified
     data2 : dataframe
-        data for the secondary axis, with datetime/timestamp index, columns will be the lines
+        data for the secondary axis, with datetime/timestamp index, columns will be the lines, it is not modified
     secondy_axis_name: string
         title for second y axis
     y_name : string, optional
@@ -427,36 +672,7 @@ def line_secondary_y(data, data2, secondy_axis_name, y_name, title='Chart title'
     figsize_y : int
     """
 
-    H = Highstock(width=figsize_x, height=figsize_y)
-
-    data = data.copy()
-    data2 = data2.copy()
-
-    groups_name = data.columns.tolist()
-    groups_name2 = data2.columns.tolist()
-
-    data['date_field'] = data.index
-    data = data.reset_index(drop=True)
-
-    data2['date_field'] = data2.index
-    data2 = data2.reset_index()
-
-    for name in groups_name:
-        data1 = data.loc[:, ('date_field', name)].values.tolist()
-        H.add_data_set(data1, 'line', name)
-
-    for name in groups_name2:
-        data3 = data2.loc[:, ('date_field', name)].values.tolist()
-        H.add_data_set(data3, 'line', name, yAxis=1)
-
     options = {
-        'legend': {
-            'enabled': True
-        },
-        'rangeSelector': {
-            'selected': int(range_sel)
-        },
-
         'title': {
             'text': title,
             'style': {
@@ -488,9 +704,8 @@ def line_secondary_y(data, data2, secondy_axis_name, y_name, title='Chart title'
 
     }
 
-    H.set_dict_options(options)
-
-    return H
+    return _build_timeseries_chart(data, 'line', options, range_sel, secondary=data2,
+                                   figsize_x=figsize_x, figsize_y=figsize_y)
 
 
 def boxplot(data, y_name, title, num_decimals, x_name='Date', figsize_x=900, figsize_y=700):
@@ -519,18 +734,13 @@ def boxplot(data, y_name, title, num_decimals, x_name='Date', figsize_x=900, fig
     data = data.copy()
 
     data.columns = ['date_field', 'column_1']
-    data = data.sort_values('column_1')
 
     mean = round(data.column_1.mean(), num_decimals)
 
-    data_box_quant = data.groupby('date_field').count()
-    for i in range(0, 125, 25):
-        data_box_quant['quantile_' + str(i)] = data.groupby('date_field').column_1.quantile(i / 100.0)
-
-    data_box_quant = data_box_quant.reset_index()
+    data_box_quant = data.groupby('date_field').column_1.quantile([0, .25, .5, .75, 1.0]).unstack()
 
-    data_box_list = data_box_quant[['date_field', 'quantile_0', 'quantile_25',
-                                    'quantile_50', 'quantile_75', 'quantile_100']].values.tolist()
+    data_box_list = np.column_stack([_to_epoch_ms(data_box_quant.index.values),
+                                     data_box_quant.values]).tolist()
 
     H.add_data_set(data_box_list, 'boxplot', y_name, tooltip={
         'headerFormat': '<em>Date {point.key}</em><br/>'})
@@ -545,7 +755,7 @@ def boxplot(data, y_name, title, num_decimals, x_name='Date', figsize_x=900, fig
         'legend': {
             'enabled': False
         },
-        'xAxis': assoc(_CommonOptions.axisFormatDateTime, 'title', {'text': x_name}),
+        'xAxis': dict(_CommonOptions.axisFormatDateTime, title={'text': x_name}),
         'yAxis': {
             'title': {
                 'text': y_name
@@ -594,7 +804,7 @@ def line_pct_change(data, y_name='', title='Chart title', range_sel=DefaultRange
     Parameters
     ----------
     data : dataframe
-        data with index and two columns, 1: date field, 2: values column
+        data with datetime/timestamp index, columns will be the lines, it is not modified
     y_name : string, optional
         title of y axis
     title : string, optional
@@ -610,25 +820,7 @@ def line_pct_change(data, y_name='', title='Chart title', range_sel=DefaultRange
     figsize_y : int
     """
 
-    H = Highstock(width=figsize_x, height=figsize_y)
-
-    data = data.copy()
-
-    groups_name = data.columns.tolist()
-    data['date_field'] = data.index
-    data = data.reset_index(drop=True)
-
-    for name in groups_name:
-        data1 = data.loc[:, ('date_field', name)].values.tolist()
-        H.add_data_set(data1, 'line', name)
-
     options = {
-        'legend': {
-            'enabled': legend
-        },
-        'rangeSelector': {
-            'selected': int(range_sel)
-        },
         'title': {
             'text': title
         },
@@ -648,11 +840,7 @@ def line_pct_change(data, y_name='', title='Chart title', range_sel=DefaultRange
             }]
         },
 
-        'plotOptions': {
-            'series': {
-                'compare': 'percent'
-            }
-        },
+        'plotOptions': _CommonOptions.plotOptionsPercentChange,
 
         'tooltip': {
             'pointFormat': '<span style="color:{series.color}">{series.name}</span>: <b>{point.y}</b> ({point.change}%)<br/>',
@@ -660,6 +848,5 @@ def line_pct_change(data, y_name='', title='Chart title', range_sel=DefaultRange
         },
     }
 
-    H.set_dict_options(options)
-
-    return H
+    return _build_timeseries_chart(data, 'line', options, range_sel, legend,
+                                   figsize_x=figsize_x, figsize_y=figsize_y)
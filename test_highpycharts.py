@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+import pytest
+
+pd = pytest.importorskip('pandas')
+hp = pytest.importorskip('highpycharts')
+
+
+@pytest.fixture
+def fast_json_pairs():
+    writer = hp._fast_json_pairs()
+    if writer is None:
+        pytest.skip('numba is not installed')
+    return writer
+
+
+@pytest.mark.parametrize('date', ['2020-01-03', '2020-01-03 12:30', '2020-01-03T00:00+05:00', '2020-01'])
+def test_to_epoch_ms_iso_strings(date, recwarn):
+    assert hp._to_epoch_ms(date) == pd.Timestamp(date).value // 10 ** 6
+    assert len(recwarn) == 0
+
+
+def test_area_colors_from_colormap_instances():
+    matplotlib = pytest.importorskip('matplotlib')
+    from matplotlib.colors import ListedColormap
+    assert hp._area_colors(3, matplotlib.colormaps['viridis']) == hp._area_colors(3, 'viridis')
+    assert list(hp._area_colors(2, ListedColormap(['#ff0000', '#0000ff']))) == ['#ff0000', '#0000ff']
+
+
+def test_nat_index_is_rejected_before_the_fast_writer():
+    n = hp._FAST_JSON_MIN_ROWS + 1
+    index = pd.date_range('2020-01-01', periods=n, freq='min').to_numpy().copy()
+    index[n // 2] = np.datetime64('NaT')
+    data = pd.DataFrame({'x': np.arange(n, dtype='float64')}, index=index)
+    with pytest.raises(ValueError, match='NaT'):
+        hp._timeseries_data(data)
+
+
+def test_timestamps_down_to_int64_min(fast_json_pairs):
+    ts = np.array([np.iinfo(np.int64).min, -86400001, -1, 0, 7, np.iinfo(np.int64).max], dtype=np.int64)
+    vals = np.zeros(len(ts))
+    points = json.loads(fast_json_pairs(ts, vals))
+    assert [t for t, _ in points] == ts.tolist()
+
+
+def test_values_match_json_loads_and_15g(fast_json_pairs):
+    rng = np.random.default_rng(0)
+    vals = rng.uniform(1, 10, 200000) * 10.0 ** rng.integers(-8, 37, 200000)
+    vals[::2] *= -1
+    vals = np.concatenate([vals, [0.0, -0.0, 0.1, 1e-8, 1e15, 1234567890123455.0, 9.99999999999999e36]])
+    ts = np.arange(len(vals), dtype=np.int64)
+    points = json.loads(fast_json_pairs(ts, vals))
+    assert [v for _, v in points] == [float('%.15g' % v) for v in vals]
+
+
+def test_nan_and_infinities_are_null(fast_json_pairs):
+    vals = np.array([np.nan, np.inf, -np.inf, 1.5])
+    points = json.loads(fast_json_pairs(np.arange(4, dtype=np.int64), vals))
+    assert [v for _, v in points] == [None, None, None, 1.5]